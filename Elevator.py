@@ -2,92 +2,585 @@ from enum import Enum
 class Direction(Enum):
     UP = 1
     DOWN = 2
+    IDLE = 3
 
 class Request:
-    def __init__(self, source_floor, destination_floor):
+    def __init__(self, source_floor, destination_floor, created_at=0.0):
         self.source_floor = source_floor
         self.destination_floor = destination_floor
-    
+        self.created_at = created_at
+        self.picked_up_at = None
+        self.dropped_off_at = None
+
+    @property
+    def direction(self):
+        return Direction.UP if self.destination_floor > self.source_floor else Direction.DOWN
+
 import time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, deque
 from threading import Lock, Condition
-from request import Request
-from direction import Direction
+
+
+class CarMetrics:
+    """Running counters for one car; read them through Elevator.metrics()."""
+    def __init__(self):
+        self.accepted = 0
+        self.dropped = 0  # requests rejected because the car's queue was full
+        self.picked_up = 0
+        self.total_wait = 0.0  # request to pickup, summed over picked_up riders
+        self.max_queue_depth = 0
+
+    def record_accept(self, depth: int):
+        self.accepted += 1
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+
+    def record_pickup(self, request: Request):
+        self.picked_up += 1
+        self.total_wait += request.picked_up_at - request.created_at
 
 
 class Elevator:
-    def __init__(self, id: int, capacity: int):
+    """Serves its requests strictly first come, first served, one rider at a time.
+
+    Motion is split into step() calls, each moving one floor or stopping at
+    one floor, so the same logic can run on a thread (run) or be driven by a
+    simulator.
+    """
+    def __init__(self, id: int, capacity: int, floor_time=1.0, dwell_time=1.0, verbose=True,
+                 record_completed=False):
         self.id = id
         self.capacity = capacity
+        self.floor_time = floor_time
+        self.dwell_time = dwell_time
+        self.verbose = verbose
         self.current_floor = 1
         self.current_direction = Direction.UP
-        self.requests = []
+        self.requests = deque()  # bounded by capacity; add_request rejects when full
+        self.current_request = None
+        self.riding = False
+        self.completed = [] if record_completed else None  # requests dropped off, kept for simulations
+        self.index = None  # CarIndex kept informed of this car's floor and direction
+        self.stats = CarMetrics()
         self.lock = Lock()
         self.condition = Condition(self.lock)
 
-    def add_request(self, request: Request):
+    def add_request(self, request: Request) -> bool:
+        """Queues a request; returns False (and counts a drop) if the queue is full."""
         with self.lock:
-            if len(self.requests) < self.capacity:
-                self.requests.append(request)
+            if self.queue_depth() >= self.capacity:
+                self.stats.dropped += 1
+                return False
+            self._enqueue(request)
+            self.stats.record_accept(self.queue_depth())
+            if self.verbose:
                 print(
                     f"Elevator {self.id} added request: {request.source_floor} to {request.destination_floor}"
                 )
-                self.condition.notify_all()
+            self.condition.notify_all()
+            return True
+
+    def _enqueue(self, request: Request):
+        self.requests.append(request)
+
+    def queue_depth(self) -> int:
+        """Requests assigned to this car and not yet picked up."""
+        return len(self.requests)
+
+    def metrics(self) -> dict:
+        """A consistent snapshot of this car's counters."""
+        with self.lock:
+            stats = self.stats
+            return {
+                "queue_depth": self.queue_depth(),
+                "max_queue_depth": stats.max_queue_depth,
+                "accepted": stats.accepted,
+                "dropped": stats.dropped,
+                "picked_up": stats.picked_up,
+                "average_wait": stats.total_wait / stats.picked_up if stats.picked_up else 0.0,
+            }
 
     def get_next_request(self) -> Request:
         with self.lock:
             while not self.requests:
                 self.condition.wait()
-            return self.requests.pop(0)
+            return self.requests.popleft()
 
-    def process_requests(self):
-        while True:
-            request = self.get_next_request()  # This will wait until there's a request
-            self.process_request(request)
-
-    def process_request(self, request: Request):
-        start_floor = self.current_floor
-        end_floor = request.destination_floor
-
-        if start_floor < end_floor:
-            self.current_direction = Direction.UP
-            for i in range(start_floor, end_floor + 1):
-                self.current_floor = i
-                print(f"Elevator {self.id} reached floor {self.current_floor}")
-                time.sleep(1)  # Simulating elevator movement
-        elif start_floor > end_floor:
-            self.current_direction = Direction.DOWN
-            for i in range(start_floor, end_floor - 1, -1):
-                self.current_floor = i
-                print(f"Elevator {self.id} reached floor {self.current_floor}")
-                time.sleep(1)  # Simulating elevator movement
+    def has_work(self) -> bool:
+        return self.current_request is not None or bool(self.requests)
+
+    def step(self, now: float):
+        """Moves one floor or stops at the current one; returns the time taken, or None if idle."""
+        duration = self._step(now)
+        if self.index is not None:
+            self.index.update(self)
+        return duration
+
+    def _step(self, now: float):
+        if self.current_request is None:
+            if not self.requests:
+                return None
+            self.current_request = self.requests.popleft()
+        request = self.current_request
+        target = request.destination_floor if self.riding else request.source_floor
+        if self.current_floor == target:
+            if self.riding:
+                request.dropped_off_at = now
+                if self.completed is not None:
+                    self.completed.append(request)
+                self.current_request = None
+                self.riding = False
+            else:
+                request.picked_up_at = now
+                self.stats.record_pickup(request)
+                self.riding = True
+            return self.dwell_time
+        self._move_towards(target)
+        return self.floor_time
+
+    def _move_towards(self, floor: int):
+        self.current_direction = Direction.UP if floor > self.current_floor else Direction.DOWN
+        self.current_floor += 1 if floor > self.current_floor else -1
+        if self.verbose:
+            print(f"Elevator {self.id} reached floor {self.current_floor}")
+
+    def estimate_time_to_serve(self, source_floor: int, direction: Direction) -> float:
+        """Rough time until this car can pick up at source_floor; FIFO cars use raw distance."""
+        return abs(source_floor - self.current_floor) * self.floor_time
 
     def run(self):
-        self.process_requests()
+        while True:
+            with self.lock:
+                while not self.has_work():
+                    self.condition.wait()
+                duration = self.step(time.monotonic())
+            time.sleep(duration)  # Simulating elevator movement
+
+
+class LookElevator(Elevator):
+    """LOOK scheduling: sweep in one direction serving every stop on the way, then reverse.
+
+    Pickups are kept in a sorted stop list for the direction the rider wants
+    to travel, so a car only collects riders heading its way; destinations
+    join the list as riders board. At most cab_capacity riders are aboard at
+    once. Once a stop's dwell is over the car moves on: riders who arrive at
+    that floor afterwards, or who did not fit, are picked up on a later sweep.
+    """
+    def __init__(self, id: int, capacity: int, floor_time=1.0, dwell_time=1.0, verbose=True,
+                 record_completed=False, cab_capacity=20):
+        super().__init__(id, capacity, floor_time, dwell_time, verbose, record_completed)
+        self.current_direction = Direction.IDLE
+        self.cab_capacity = cab_capacity
+        self.up_stops = []  # sorted floors to stop at while moving up
+        self.down_stops = []  # sorted floors to stop at while moving down
+        self.waiting = defaultdict(list)  # floor -> requests waiting to board
+        self.riders = defaultdict(list)  # floor -> riders getting off there
+        self.pending = 0  # requests assigned but not yet picked up
+        self.pending_span = None  # (lowest, highest) floor any pending request travels between
+        self.load = 0  # riders aboard
+        self.served_floor = None  # floor of the stop that just ended
+        self.served_directions = set()  # directions already served there; not served again until the car moves
+
+    def _enqueue(self, request: Request):
+        self.pending += 1
+        low, high = sorted((request.source_floor, request.destination_floor))
+        if self.pending_span is not None:
+            low, high = min(low, self.pending_span[0]), max(high, self.pending_span[1])
+        self.pending_span = (low, high)
+        self.waiting[request.source_floor].append(request)
+        self._add_stop(request.source_floor, request.direction)
+
+    def queue_depth(self) -> int:
+        return self.pending
+
+    def has_work(self) -> bool:
+        return bool(self.up_stops or self.down_stops)
+
+    def _stops(self, direction: Direction):
+        return self.up_stops if direction == Direction.UP else self.down_stops
+
+    def _add_stop(self, floor: int, direction: Direction):
+        stops = self._stops(direction)
+        i = bisect_left(stops, floor)
+        if i == len(stops) or stops[i] != floor:
+            stops.insert(i, floor)
+
+    def _has_stop(self, floor: int, direction: Direction) -> bool:
+        stops = self._stops(direction)
+        i = bisect_left(stops, floor)
+        return i < len(stops) and stops[i] == floor
+
+    def _held(self, floor: int, direction: Direction) -> bool:
+        """Whether the car just served `floor` heading `direction` and has somewhere else to go."""
+        return floor == self.served_floor and direction in self.served_directions and any(
+            stops and (stops[0] != floor or stops[-1] != floor) for stops in (self.up_stops, self.down_stops))
+
+    def _stops_ahead(self, direction: Direction) -> bool:
+        floor = self.current_floor
+        if direction == Direction.UP:
+            return any(stops and stops[-1] > floor for stops in (self.up_stops, self.down_stops))
+        return any(stops and stops[0] < floor for stops in (self.up_stops, self.down_stops))
+
+    def _step(self, now: float):
+        if not self.has_work():
+            self.current_direction = Direction.IDLE
+            return None
+        floor = self.current_floor
+        direction = self.current_direction
+        if direction == Direction.IDLE:
+            direction = self._direction_from_idle()
+        if not self._held(floor, direction) and self._has_stop(floor, direction):
+            return self._serve(direction, now)
+        if not self._stops_ahead(direction):
+            opposite = Direction.DOWN if direction == Direction.UP else Direction.UP
+            if not self._held(floor, opposite) and self._has_stop(floor, opposite):
+                return self._serve(opposite, now)
+            direction = opposite
+        self.current_direction = direction
+        self.served_floor = None
+        self.served_directions.clear()
+        self._move_towards(floor + 1 if direction == Direction.UP else floor - 1)
+        return self.floor_time
+
+    def _direction_from_idle(self) -> Direction:
+        floor = self.current_floor
+        if self._has_stop(floor, Direction.UP):
+            return Direction.UP
+        if self._has_stop(floor, Direction.DOWN):
+            return Direction.DOWN
+        nearest = min(self.up_stops + self.down_stops, key=lambda stop: abs(stop - floor))
+        return Direction.UP if nearest > floor else Direction.DOWN
+
+    def _serve(self, direction: Direction, now: float) -> float:
+        floor = self.current_floor
+        self.current_direction = direction
+        self._stops(direction).remove(floor)
+        self.served_floor = floor
+        self.served_directions.add(direction)
+        for rider in self.riders.pop(floor, ()):
+            rider.dropped_off_at = now
+            if self.completed is not None:
+                self.completed.append(rider)
+            self.load -= 1
+        waiting = self.waiting.get(floor, [])
+        staying = []
+        for request in waiting:
+            if request.direction != direction:
+                staying.append(request)
+                continue
+            if self.load >= self.cab_capacity:
+                staying.append(request)
+                self._add_stop(floor, direction)  # the cab is full; come back for them
+                continue
+            request.picked_up_at = now
+            self.stats.record_pickup(request)
+            self.pending -= 1
+            if not self.pending:
+                self.pending_span = None
+            self.load += 1
+            self.riders[request.destination_floor].append(request)
+            self._add_stop(request.destination_floor, direction)
+        if staying:
+            self.waiting[floor] = staying
+        else:
+            self.waiting.pop(floor, None)
+        if self.verbose:
+            print(f"Elevator {self.id} stopped at floor {floor}")
+        return self.dwell_time
+
+    def _stops_between(self, low: int, high: int) -> int:
+        return sum(bisect_right(stops, high) - bisect_left(stops, low) for stops in (self.up_stops, self.down_stops))
+
+    def estimate_time_to_serve(self, source_floor: int, direction: Direction) -> float:
+        """Travel along the LOOK sweep to source_floor, plus a dwell for each stop on the way.
+
+        A car that has just closed its doors at source_floor only returns on a
+        later sweep, and every cab-load of riders and assigned pickups already
+        on the car costs one extra round trip over the floors they travel.
+        """
+        floor = self.current_floor
+        if self.current_direction == Direction.IDLE or not self.has_work():
+            return abs(source_floor - floor) * self.floor_time
+        ends = self.up_stops[:1] + self.up_stops[-1:] + self.down_stops[:1] + self.down_stops[-1:] + [floor]
+        top, bottom = max(ends), min(ends)
+        stops = len(self.up_stops) + len(self.down_stops)
+        if source_floor == floor and self._held(floor, direction):
+            travel = 2 * (top - bottom)  # out to the far end of the sweep and back
+        elif self.current_direction == Direction.UP:
+            if direction == Direction.UP and source_floor >= floor:
+                travel, stops = source_floor - floor, self._stops_between(floor, source_floor)
+            elif direction == Direction.DOWN:
+                top = max(top, source_floor)
+                travel = (top - floor) + (top - source_floor)
+            else:
+                bottom = min(bottom, source_floor)
+                travel = (top - floor) + (top - bottom) + (source_floor - bottom)
+        else:
+            if direction == Direction.DOWN and source_floor <= floor:
+                travel, stops = floor - source_floor, self._stops_between(source_floor, floor)
+            elif direction == Direction.UP:
+                bottom = min(bottom, source_floor)
+                travel = (floor - bottom) + (source_floor - bottom)
+            else:
+                top = max(top, source_floor)
+                travel = (floor - bottom) + (top - bottom) + (top - source_floor)
+        trips = (self.load + self.pending) // self.cab_capacity
+        if trips:
+            if self.pending_span is not None:
+                top, bottom = max(top, self.pending_span[1]), min(bottom, self.pending_span[0])
+            travel += trips * 2 * (top - bottom)
+            stops += trips * self.cab_capacity
+        return travel * self.floor_time + stops * self.dwell_time
+
+
+from bisect import bisect_left, insort
+from threading import Lock, Thread
+
+
+class CarIndex:
+    """Cars ordered by floor, in separate sorted lists for idle, up- and down-moving cars.
+
+    Cars report every floor or direction change through update(), so finding
+    the cars nearest a floor is a binary search rather than a scan of the
+    whole bank.
+    """
+    def __init__(self):
+        self.lock = Lock()
+        self.by_direction = {direction: [] for direction in Direction}  # sorted (floor, car id)
+        self.positions = {}  # car id -> (direction, floor)
+        self.cars = {}
+
+    def update(self, elevator: Elevator):
+        position = (elevator.current_direction, elevator.current_floor)
+        with self.lock:
+            old = self.positions.get(elevator.id)
+            if old == position:
+                return
+            if old is not None:
+                cars = self.by_direction[old[0]]
+                del cars[bisect_left(cars, (old[1], elevator.id))]
+            self.cars[elevator.id] = elevator
+            self.positions[elevator.id] = position
+            insort(self.by_direction[position[0]], (position[1], elevator.id))
+
+    def nearest(self, floor: int, per_side=2):
+        """Up to per_side cars on each side of `floor` from each direction list."""
+        found = set()
+        with self.lock:
+            for cars in self.by_direction.values():
+                i = bisect_left(cars, (floor, -1))
+                found.update(car_id for _, car_id in cars[max(0, i - per_side):i + per_side])
+            return [self.cars[car_id] for car_id in found]
 
-from threading import Thread
-from elevator import Elevator
-from request import Request
 
 class ElevatorController:
-    def __init__(self, num_elevators: int, capacity: int):
+    def __init__(self, num_elevators: int, capacity: int, elevator_cls=LookElevator, threaded=True, verbose=True,
+                 floor_time=1.0, dwell_time=1.0, indexed=True):
         self.elevators = []
+        self.verbose = verbose
+        self.rejected = 0  # requests no car could take
+        self._rejected_lock = Lock()  # request_elevator may be called from many threads
+        self.index = CarIndex() if indexed else None
         for i in range(num_elevators):
-            elevator = Elevator(i + 1, capacity)
+            # Long-running threaded cars report through CarMetrics; only simulations keep every request.
+            elevator = elevator_cls(i + 1, capacity, floor_time, dwell_time, verbose, record_completed=not threaded)
             self.elevators.append(elevator)
-            Thread(target=elevator.run).start()
+            if self.index is not None:
+                elevator.index = self.index
+                self.index.update(elevator)
+            if threaded:
+                Thread(target=elevator.run).start()
+
+    def request_elevator(self, source_floor: int, destination_floor: int, now=None):
+        """Assigns a new request to the best car with room and returns that car.
 
-    def request_elevator(self, source_floor: int, destination_floor: int):
-        optimal_elevator = self.find_optimal_elevator(source_floor, destination_floor)
-        optimal_elevator.add_request(Request(source_floor, destination_floor))
+        A car whose queue is full rejects the request and it is rerouted to
+        the next best car; returns None if every car is full.
+        """
+        request = Request(source_floor, destination_floor, time.monotonic() if now is None else now)
+        for elevator in self._ranked_elevators(source_floor, request.direction):
+            if elevator.add_request(request):
+                return elevator
+        with self._rejected_lock:
+            self.rejected += 1
+        if self.verbose:
+            print(f"No elevator available for request: {source_floor} to {destination_floor}")
+        return None
 
     def find_optimal_elevator(self, source_floor: int, destination_floor: int) -> Elevator:
-        optimal_elevator = None
-        min_distance = float('inf')
+        """The car with the lowest estimated time to reach source_floor heading the rider's way."""
+        direction = Direction.UP if destination_floor > source_floor else Direction.DOWN
+        return next(self._ranked_elevators(source_floor, direction), None)
+
+    def _ranked_elevators(self, source_floor: int, direction: Direction):
+        """Cars in order of estimated time to serve, each estimate taken under that car's lock.
+
+        With an index only the cars nearest the floor in each direction are
+        ranked; the rest follow, unranked, as a fallback for rerouting.
+        """
+        candidates = self.elevators if self.index is None else self.index.nearest(source_floor)
+        estimates = []
+        for elevator in candidates:
+            with elevator.lock:
+                estimates.append((elevator.estimate_time_to_serve(source_floor, direction), elevator.id, elevator))
+        estimates.sort()
+        for _, _, elevator in estimates:
+            yield elevator
+        if len(candidates) < len(self.elevators):
+            ranked = {elevator.id for _, _, elevator in estimates}
+            yield from (elevator for elevator in self.elevators if elevator.id not in ranked)
+
+    def metrics(self) -> dict:
+        """Per-car counters keyed by car id, plus requests rejected by every car."""
+        return {"rejected": self.rejected, "cars": {elevator.id: elevator.metrics() for elevator in self.elevators}}
+
+import heapq
+import random
+
+
+class ElevatorSimulation:
+    """Discrete-event simulation of an ElevatorController on a virtual clock.
+
+    Events live in a heap ordered by virtual time: request arrivals, and the
+    end of each car's current step (one floor or one stop). Cars run the same
+    step() logic as the threaded controller but nothing sleeps, so an hour
+    of traffic replays as fast as the events can be processed. The controller
+    must be created with threaded=False.
+    """
+    ARRIVAL, STEP = 0, 1
+
+    def __init__(self, controller: ElevatorController):
+        self.controller = controller
+        self.now = 0.0
+        self.events = []
+        self._seq = 0
+        self._stepping = set()  # ids of cars with a STEP event queued
+
+    def _push(self, at, kind, payload):
+        heapq.heappush(self.events, (at, self._seq, kind, payload))
+        self._seq += 1
+
+    def add_request(self, at: float, source_floor: int, destination_floor: int):
+        self._push(at, self.ARRIVAL, (source_floor, destination_floor))
+
+    def run(self, until=float('inf')):
+        """Processes events up to virtual time `until` (or until none are left)."""
+        while self.events and self.events[0][0] <= until:
+            self.now, _, kind, payload = heapq.heappop(self.events)
+            if kind == self.ARRIVAL:
+                elevator = self.controller.request_elevator(*payload, now=self.now)
+                if elevator is not None and elevator.id not in self._stepping:
+                    self._stepping.add(elevator.id)
+                    self._push(self.now, self.STEP, elevator)
+            else:
+                duration = payload.step(self.now)
+                if duration is None:
+                    self._stepping.discard(payload.id)
+                else:
+                    self._push(self.now + duration, self.STEP, payload)
+
+    def completed_requests(self):
+        return [request for elevator in self.controller.elevators for request in elevator.completed]
+
+    def summary(self):
+        """Served count plus average and 95th-percentile wait, and average trip time."""
+        requests = self.completed_requests()
+        if not requests:
+            return {"served": 0}
+        waits = sorted(r.picked_up_at - r.created_at for r in requests)
+        return {
+            "served": len(requests),
+            "average_wait": sum(waits) / len(waits),
+            "p95_wait": waits[len(waits) * 95 // 100],
+            "average_trip": sum(r.dropped_off_at - r.created_at for r in requests) / len(requests),
+        }
+
+
+def rush_hour_profile(num_floors=100, duration=3600.0, arrivals_per_second=2.0, seed=1):
+    """Morning up-peak traffic: mostly lobby-to-floor trips, some inter-floor and down trips.
+
+    Yields (time, source_floor, destination_floor) in time order.
+    """
+    rng = random.Random(seed)
+    now = rng.expovariate(arrivals_per_second)
+    while now < duration:
+        kind = rng.random()
+        if kind < 0.85:
+            yield now, 1, rng.randint(2, num_floors)
+        elif kind < 0.95:
+            source, destination = rng.sample(range(2, num_floors + 1), 2)
+            yield now, source, destination
+        else:
+            yield now, rng.randint(2, num_floors), 1
+        now += rng.expovariate(arrivals_per_second)
+
+
+def simulate(profile, num_elevators, elevator_cls=LookElevator, capacity=10_000, floor_time=1.0, dwell_time=1.0):
+    """Replays a traffic profile through a fresh, unthreaded controller and returns the simulation."""
+    controller = ElevatorController(num_elevators, capacity, elevator_cls, threaded=False, verbose=False,
+                                    floor_time=floor_time, dwell_time=dwell_time)
+    simulation = ElevatorSimulation(controller)
+    for at, source_floor, destination_floor in profile:
+        simulation.add_request(at, source_floor, destination_floor)
+    simulation.run()
+    return simulation
+
+
+def compare_dispatch(num_floors=20, num_elevators=4, num_requests=2000, arrivals_per_second=0.3, seed=1):
+    """Replays the same random traffic through FIFO and LOOK cars.
+
+    Returns {class name: summary()} where wait is request to pickup and trip
+    is request to drop-off, in seconds of simulated time.
+    """
+    rng = random.Random(seed)
+    profile, now = [], 0.0
+    for _ in range(num_requests):
+        now += rng.expovariate(arrivals_per_second)
+        source, destination = rng.sample(range(1, num_floors + 1), 2)
+        profile.append((now, source, destination))
+    return {
+        elevator_cls.__name__: simulate(profile, num_elevators, elevator_cls).summary()
+        for elevator_cls in (Elevator, LookElevator)
+    }
+
+
+def benchmark_dispatch(num_elevators=200, num_floors=100, requests_per_second=10_000, seconds=2.0, seed=1):
+    """Measures request_elevator throughput for a large bank, indexed versus a full scan.
+
+    Cars are first spread over the building by replaying some traffic, then
+    requests_per_second * seconds assignments are timed on each controller.
+    """
+    count = int(requests_per_second * seconds)
+    rng = random.Random(seed)
+    warmup = [(i * 0.05, *rng.sample(range(1, num_floors + 1), 2)) for i in range(4 * num_elevators)]
+    requests = [tuple(rng.sample(range(1, num_floors + 1), 2)) for _ in range(count)]
+    for indexed in (False, True):
+        controller = ElevatorController(num_elevators, 10**9, threaded=False, verbose=False, indexed=indexed)
+        simulation = ElevatorSimulation(controller)
+        for at, source_floor, destination_floor in warmup:
+            simulation.add_request(at, source_floor, destination_floor)
+        simulation.run(until=60.0)
+        start = time.perf_counter()
+        for source_floor, destination_floor in requests:
+            controller.request_elevator(source_floor, destination_floor, simulation.now)
+        rate = count / (time.perf_counter() - start)
+        print(f"{'Indexed' if indexed else 'Full scan'}: {rate:,.0f} requests/s across {num_elevators} cars "
+              f"({'meets' if rate >= requests_per_second else 'misses'} {requests_per_second:,}/s)")
+
+
+if __name__ == "__main__":
+    for name, summary in compare_dispatch().items():
+        print(f"{name}: average wait {summary['average_wait']:.1f}s, average trip {summary['average_trip']:.1f}s")
+
+    start = time.perf_counter()
+    simulation = simulate(rush_hour_profile(), num_elevators=50, floor_time=1.5, dwell_time=5.0)
+    print(f"Rush hour, 100 floors, 50 cars: {simulation.summary()} "
+          f"simulated {simulation.now / 60:.0f} min in {time.perf_counter() - start:.2f}s")
 
-        for elevator in self.elevators:
-            distance = abs(source_floor - elevator.current_floor)
-            if distance < min_distance:
-                min_distance = distance
-                optimal_elevator = elevator
+    benchmark_dispatch()
 
-        return optimal_elevator
\ No newline at end of file
+    simulation = simulate(rush_hour_profile(num_floors=30, duration=600.0), num_elevators=4, capacity=5)
+    metrics = simulation.controller.metrics()
+    print(f"Overloaded bank (4 cars, queue limit 5): {metrics['rejected']} requests rejected")
+    for car_id, car in metrics["cars"].items():
+        print(f"  Car {car_id}: {car}")
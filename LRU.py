@@ -1,8 +1,39 @@
-from node import Node
+import heapq
+import random
+import time
+import tracemalloc
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import wraps
+from itertools import count
+from threading import Event, Lock, Thread
+
+class Node:
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+        self.prev = None
+        self.next = None
 
 class LRUCache:
-    def __init__(self, capacity):
+    """LRU cache with optional per-entry TTL and size-weighted capacity.
+
+    With a weigher, capacity is a total weight budget (e.g. bytes) instead of
+    an entry count. Expired entries are dropped lazily on get, or in bounded
+    batches by sweep_expired. LRUCache is not thread-safe, so it runs no
+    sweeper of its own: call sweep_expired from the owning loop, or use
+    ShardedLRUCache.start_sweeper.
+    """
+    def __init__(self, capacity, weigher=None, default_ttl=None):
         self.capacity = capacity
+        self.weigher = weigher
+        self.default_ttl = default_ttl
+        self.size = 0
+        self.weights = {}
+        self.expires_at = {}
+        self._expiry_heap = []  # (expires_at, seq, key); stale entries skipped lazily
+        self._seq = count()
         self.cache = {}
         self.head = Node(None, None)
         self.tail = Node(None, None)
@@ -11,12 +42,15 @@ class LRUCache:
 
     def get(self, key):
         if key in self.cache:
+            if self.expires_at and self._is_expired(key):
+                self._discard(key)
+                return None
             node = self.cache[key]
             self._move_to_head(node)
             return node.value
         return None
 
-    def put(self, key, value):
+    def put(self, key, value, ttl=None):
         if key in self.cache:
             node = self.cache[key]
             node.value = value
@@ -25,9 +59,118 @@ class LRUCache:
             node = Node(key, value)
             self.cache[key] = node
             self._add_to_head(node)
-            if len(self.cache) > self.capacity:
-                removed_node = self._remove_tail()
-                del self.cache[removed_node.key]
+        self._account(key, value, ttl)
+        self._evict()
+
+    def get_many(self, keys):
+        """Look up several keys at once; returns a dict of the keys that hit.
+
+        Each hit node is unlinked once and the batch is spliced back in at the
+        head in one pass, with the last requested key becoming most recent.
+        """
+        found = {}
+        for key in keys:
+            if key in found:
+                del found[key]  # re-insert so dict order follows the last request
+            elif key not in self.cache:
+                continue
+            elif self.expires_at and self._is_expired(key):
+                self._discard(key)
+                continue
+            found[key] = self.cache[key]
+        for node in found.values():
+            self._remove_node(node)
+        self._splice_to_head(found.values())
+        return {key: node.value for key, node in found.items()}
+
+    def put_many(self, items, ttl=None):
+        """Insert or update several entries, relinking once and evicting once at the end."""
+        if not isinstance(items, dict):
+            ordered = {}
+            for key, value in items:
+                ordered.pop(key, None)  # a repeated key counts as its last write
+                ordered[key] = value
+            items = ordered
+        nodes = []
+        for key, value in items.items():
+            node = self.cache.get(key)
+            if node is None:
+                node = Node(key, value)
+                self.cache[key] = node
+            else:
+                node.value = value
+                self._remove_node(node)
+            nodes.append(node)
+            self._account(key, value, ttl)
+        self._splice_to_head(nodes)
+        self._evict()
+
+    def _account(self, key, value, ttl):
+        if self.weigher is not None:
+            weight = self.weigher(value)
+            self.size += weight - self.weights.get(key, 0)
+            self.weights[key] = weight
+        self._set_expiry(key, self.default_ttl if ttl is None else ttl)
+
+    def _evict(self):
+        while self._over_capacity():
+            removed_node = self._remove_tail()
+            self._forget(removed_node.key)
+
+    def _splice_to_head(self, nodes):
+        # Link nodes (least to most recent) into a chain and attach it after head.
+        first = self.head.next
+        after = first
+        for node in nodes:
+            node.next = after
+            after.prev = node
+            after = node
+        self.head.next = after
+        after.prev = self.head
+
+    def sweep_expired(self, limit=100):
+        """Drop expired entries, examining at most `limit` expiry records."""
+        now = time.monotonic()
+        removed = 0
+        for _ in range(limit):
+            if not self._expiry_heap or self._expiry_heap[0][0] > now:
+                break
+            expires_at, _, key = heapq.heappop(self._expiry_heap)
+            if self.expires_at.get(key) == expires_at:
+                self._discard(key)
+                removed += 1
+        return removed
+
+    def _set_expiry(self, key, ttl):
+        if ttl is None:
+            self.expires_at.pop(key, None)
+            return
+        expires_at = time.monotonic() + ttl
+        self.expires_at[key] = expires_at
+        heapq.heappush(self._expiry_heap, (expires_at, next(self._seq), key))
+        # Overwritten and evicted keys leave stale records; rebuild once they dominate.
+        if len(self._expiry_heap) > 2 * len(self.expires_at) + 64:
+            self._expiry_heap = [(at, next(self._seq), k) for k, at in self.expires_at.items()]
+            heapq.heapify(self._expiry_heap)
+
+    def _is_expired(self, key):
+        expires_at = self.expires_at.get(key)
+        return expires_at is not None and expires_at <= time.monotonic()
+
+    def _over_capacity(self):
+        if self.weigher is not None:
+            return self.size > self.capacity and bool(self.cache)
+        return len(self.cache) > self.capacity
+
+    def _discard(self, key):
+        self._remove_node(self.cache[key])
+        self._forget(key)
+
+    def _forget(self, key):
+        del self.cache[key]
+        if self.weigher is not None:
+            self.size -= self.weights.pop(key)
+        self.expires_at.pop(key, None)
 
     def _add_to_head(self, node):
         node.prev = self.head
@@ -46,4 +189,513 @@ class LRUCache:
     def _remove_tail(self):
         node = self.tail.prev
         self._remove_node(node)
-        return node
\ No newline at end of file
+        return node
+
+
+class LRUShard(LRUCache):
+    """One independently locked slice of a ShardedLRUCache."""
+    def __init__(self, capacity, weigher=None, default_ttl=None):
+        super().__init__(capacity, weigher, default_ttl)
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self.lock:
+            value = super().get(key)
+            # Expired entries are dropped by get, so they count as misses.
+            if key in self.cache:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return value
+
+    def put(self, key, value, ttl=None):
+        with self.lock:
+            super().put(key, value, ttl)
+
+    def get_many(self, keys):
+        with self.lock:
+            keys = list(keys)
+            found = super().get_many(keys)
+            self.hits += len(found)
+            self.misses += len(set(keys)) - len(found)
+            return found
+
+    def put_many(self, items, ttl=None):
+        with self.lock:
+            super().put_many(items, ttl)
+
+    def sweep_expired(self, limit=100):
+        with self.lock:
+            return super().sweep_expired(limit)
+
+    def _remove_tail(self):
+        self.evictions += 1
+        return super()._remove_tail()
+
+    def __len__(self):
+        return len(self.cache)
+
+
+class ShardedLRUCache:
+    """Thread-safe LRU cache that stripes keys across independently locked shards.
+
+    Each shard keeps its own linked list, so recency is per shard rather than
+    global. Total capacity is split exactly between shards, the first
+    capacity % num_shards shards taking one extra; an unweighted cache smaller
+    than num_shards uses only `capacity` shards so none is left empty.
+    """
+    def __init__(self, capacity, num_shards=16, weigher=None, default_ttl=None):
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+        if weigher is None:
+            num_shards = max(1, min(num_shards, capacity))
+        base, extra = divmod(capacity, num_shards)
+        self.capacity = capacity
+        self.shards = [LRUShard(base + (i < extra), weigher, default_ttl) for i in range(num_shards)]
+        self._sweeper = None
+        self._stop_sweeper = Event()
+
+    def _shard_for(self, key):
+        return self.shards[hash(key) % len(self.shards)]
+
+    def get(self, key):
+        return self._shard_for(key).get(key)
+
+    def put(self, key, value, ttl=None):
+        self._shard_for(key).put(key, value, ttl)
+
+    def get_many(self, keys):
+        found = {}
+        for shard, shard_keys in self._group(keys).items():
+            found.update(shard.get_many(shard_keys))
+        return found
+
+    def put_many(self, items, ttl=None):
+        if isinstance(items, dict):
+            items = items.items()
+        for shard, shard_items in self._group(items, key=lambda item: item[0]).items():
+            shard.put_many(shard_items, ttl)
+
+    def _group(self, entries, key=lambda entry: entry):
+        groups = {}
+        for entry in entries:
+            groups.setdefault(self._shard_for(key(entry)), []).append(entry)
+        return groups
+
+    def start_sweeper(self, interval=1.0, limit_per_shard=100):
+        """Sweep expired entries in the background, a bounded batch per shard per tick."""
+        def sweep():
+            while not self._stop_sweeper.wait(interval):
+                for shard in self.shards:
+                    shard.sweep_expired(limit_per_shard)
+        self._stop_sweeper.clear()
+        self._sweeper = Thread(target=sweep, daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self):
+        if self._sweeper is not None:
+            self._stop_sweeper.set()
+            self._sweeper.join()
+            self._sweeper = None
+
+    def __len__(self):
+        return sum(len(shard) for shard in self.shards)
+
+    @property
+    def hits(self):
+        return sum(shard.hits for shard in self.shards)
+
+    @property
+    def misses(self):
+        return sum(shard.misses for shard in self.shards)
+
+    def shard_stats(self):
+        """Per-shard size, hit, miss and eviction counts, for spotting skew."""
+        return [
+            {"size": len(shard), "hits": shard.hits, "misses": shard.misses, "evictions": shard.evictions}
+            for shard in self.shards
+        ]
+
+
+def _make_key(*args, **kwargs):
+    """Default lru_memoize key: hashable form of the call, freezing lists, sets and dicts."""
+    def freeze(value):
+        if isinstance(value, (list, tuple)):
+            return tuple(freeze(v) for v in value)
+        if isinstance(value, dict):
+            return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+        if isinstance(value, (set, frozenset)):
+            return frozenset(freeze(v) for v in value)
+        return value
+    return freeze(args), freeze(kwargs)
+
+
+def lru_memoize(cache, key=None):
+    """Memoize a function in `cache` (any object with get/put).
+
+    `key` builds the cache key from the call arguments; supply one when the
+    arguments are unhashable in a way _make_key cannot freeze. Concurrent
+    misses for the same key wait on a single computation. None results are
+    not distinguishable from misses and are recomputed.
+    """
+    make_key = key or _make_key
+
+    def decorator(func):
+        lock = Lock()
+        in_flight = {}
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = make_key(*args, **kwargs)
+            with lock:
+                value = cache.get(cache_key)
+                if value is not None:
+                    return value
+                future = in_flight.get(cache_key)
+                leader = future is None
+                if leader:
+                    future = in_flight[cache_key] = Future()
+            if not leader:
+                return future.result()
+            try:
+                value = func(*args, **kwargs)
+            except BaseException as error:
+                with lock:
+                    del in_flight[cache_key]
+                future.set_exception(error)
+                raise
+            with lock:
+                cache.put(cache_key, value)
+                del in_flight[cache_key]
+            future.set_result(value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+class ArrayLRUCache:
+    """LRUCache with the linked list kept in preallocated integer arrays.
+
+    Slot 0 is the sentinel (its next is the most recent entry, its prev the
+    least recent); slots 1..capacity hold entries. No per-entry objects are
+    allocated: evicted slots are reused in place.
+    """
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        size = capacity + 1
+        self.prev = array('l', [0]) * size
+        self.next = array('l', [0]) * size
+        self.keys = [None] * size
+        self.values = [None] * size
+        self.slots = {}
+        self.free = list(range(capacity, 0, -1))
+
+    def get(self, key):
+        slot = self.slots.get(key)
+        if slot is None:
+            return None
+        self._move_to_head(slot)
+        return self.values[slot]
+
+    def put(self, key, value):
+        slot = self.slots.get(key)
+        if slot is not None:
+            self.values[slot] = value
+            self._move_to_head(slot)
+            return
+        if self.free:
+            slot = self.free.pop()
+        else:
+            slot = self._remove_tail()
+            del self.slots[self.keys[slot]]
+        self.keys[slot] = key
+        self.values[slot] = value
+        self.slots[key] = slot
+        self._add_to_head(slot)
+
+    def __len__(self):
+        return len(self.slots)
+
+    def _add_to_head(self, slot):
+        first = self.next[0]
+        self.prev[slot] = 0
+        self.next[slot] = first
+        self.prev[first] = slot
+        self.next[0] = slot
+
+    def _remove_node(self, slot):
+        prev, nxt = self.prev[slot], self.next[slot]
+        self.next[prev] = nxt
+        self.prev[nxt] = prev
+
+    def _move_to_head(self, slot):
+        self._remove_node(slot)
+        self._add_to_head(slot)
+
+    def _remove_tail(self):
+        slot = self.prev[0]
+        self._remove_node(slot)
+        return slot
+
+
+_HALVE = bytes(value >> 1 for value in range(256))
+
+
+class CountMinSketch:
+    """Approximate access-frequency counter with periodic aging (for TinyLFU)."""
+    def __init__(self, width, depth=4, sample_size=None):
+        self.width = 1 << max(4, (width - 1).bit_length())
+        self.mask = self.width - 1
+        self.seeds = [0x9E3779B1 * (i + 1) for i in range(depth)]
+        self.rows = [bytearray(self.width) for _ in range(depth)]
+        self.sample_size = sample_size or 10 * width
+        self.additions = 0
+
+    def _indexes(self, key):
+        h = hash(key)
+        return [((h ^ seed) * 0x85EBCA6B >> 7) & self.mask for seed in self.seeds]
+
+    def increment(self, key):
+        for row, index in zip(self.rows, self._indexes(key)):
+            if row[index] < 15:
+                row[index] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self._reset()
+
+    def estimate(self, key):
+        return min(row[index] for row, index in zip(self.rows, self._indexes(key)))
+
+    def _reset(self):
+        # Halve every counter so old popularity decays; translate does it in C.
+        for row in self.rows:
+            row[:] = row.translate(_HALVE)
+        self.additions //= 2
+
+
+class WTinyLFUCache:
+    """Window LRU in front of a segmented LRU, guarded by a TinyLFU admission filter.
+
+    A window victim only enters the main region if the sketch says it is
+    accessed more often than the main region's own victim, so one-off scans
+    cannot flush the frequently used entries.
+    """
+    def __init__(self, capacity, window_ratio=0.01, protected_ratio=0.8):
+        if capacity < 2:
+            raise ValueError("capacity must be at least 2 (one window and one main entry)")
+        self.capacity = capacity
+        self.window_capacity = max(1, min(capacity - 1, int(capacity * window_ratio)))
+        self.main_capacity = capacity - self.window_capacity
+        self.protected_capacity = int(self.main_capacity * protected_ratio)
+        self.window = OrderedDict()
+        self.probation = OrderedDict()
+        self.protected = OrderedDict()
+        self.sketch = CountMinSketch(capacity)
+
+    def get(self, key):
+        self.sketch.increment(key)
+        if key in self.window:
+            self.window.move_to_end(key)
+            return self.window[key]
+        if key in self.protected:
+            self.protected.move_to_end(key)
+            return self.protected[key]
+        if key in self.probation:
+            value = self.probation.pop(key)
+            self._promote(key, value)
+            return value
+        return None
+
+    def put(self, key, value):
+        for region in (self.window, self.protected, self.probation):
+            if key in region:
+                region[key] = value
+                self.get(key)
+                return
+        self.sketch.increment(key)
+        self.window[key] = value
+        if len(self.window) > self.window_capacity:
+            self._admit(*self.window.popitem(last=False))
+
+    def __len__(self):
+        return len(self.window) + len(self.probation) + len(self.protected)
+
+    def _promote(self, key, value):
+        self.protected[key] = value
+        if len(self.protected) > self.protected_capacity:
+            demoted_key, demoted_value = self.protected.popitem(last=False)
+            self.probation[demoted_key] = demoted_value
+
+    def _admit(self, candidate, value):
+        if len(self.probation) + len(self.protected) < self.main_capacity:
+            self.probation[candidate] = value
+            return
+        victim = next(iter(self.probation or self.protected))
+        if self.sketch.estimate(candidate) > self.sketch.estimate(victim):
+            (self.probation if victim in self.probation else self.protected).pop(victim)
+            self.probation[candidate] = value
+
+
+class TwoQueueCache:
+    """2Q: new keys sit in a FIFO (A1in) and only reach the LRU (Am) if they are
+    seen again while remembered in the ghost queue (A1out)."""
+    def __init__(self, capacity, in_ratio=0.25, out_ratio=0.5):
+        self.capacity = capacity
+        self.in_capacity = max(1, int(capacity * in_ratio))
+        self.out_capacity = max(1, int(capacity * out_ratio))
+        self.a1_in = OrderedDict()
+        self.a1_out = OrderedDict()
+        self.am = OrderedDict()
+
+    def get(self, key):
+        if key in self.am:
+            self.am.move_to_end(key)
+            return self.am[key]
+        return self.a1_in.get(key)
+
+    def put(self, key, value):
+        if key in self.am:
+            self.am[key] = value
+            self.am.move_to_end(key)
+            return
+        if key in self.a1_in:
+            self.a1_in[key] = value
+            return
+        if len(self.a1_in) + len(self.am) >= self.capacity:
+            self._reclaim()
+        if key in self.a1_out:
+            del self.a1_out[key]
+            self.am[key] = value
+        else:
+            self.a1_in[key] = value
+
+    def __len__(self):
+        return len(self.a1_in) + len(self.am)
+
+    def _reclaim(self):
+        if len(self.a1_in) > self.in_capacity or not self.am:
+            old_key, _ = self.a1_in.popitem(last=False)
+            self.a1_out[old_key] = None
+            if len(self.a1_out) > self.out_capacity:
+                self.a1_out.popitem(last=False)
+        else:
+            self.am.popitem(last=False)
+
+
+class ARCCache:
+    """Adaptive Replacement Cache: balances recency (T1) against frequency (T2),
+    tuning the split `p` from hits in the ghost lists B1 and B2."""
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.p = 0
+        self.t1 = OrderedDict()
+        self.t2 = OrderedDict()
+        self.b1 = OrderedDict()
+        self.b2 = OrderedDict()
+
+    def get(self, key):
+        if key in self.t1:
+            value = self.t1.pop(key)
+            self.t2[key] = value
+            return value
+        if key in self.t2:
+            self.t2.move_to_end(key)
+            return self.t2[key]
+        return None
+
+    def put(self, key, value):
+        if key in self.t1 or key in self.t2:
+            self.t1.pop(key, None)
+            self.t2.pop(key, None)
+            self.t2[key] = value
+            return
+        c = self.capacity
+        if key in self.b1:
+            self.p = min(c, self.p + max(len(self.b2) // len(self.b1), 1))
+            self._replace(key)
+            del self.b1[key]
+            self.t2[key] = value
+            return
+        if key in self.b2:
+            self.p = max(0, self.p - max(len(self.b1) // len(self.b2), 1))
+            # REPLACE runs while key is still in B2, so its tie-break can see it.
+            self._replace(key)
+            del self.b2[key]
+            self.t2[key] = value
+            return
+        if len(self.t1) + len(self.b1) >= c:
+            if len(self.t1) < c:
+                self.b1.popitem(last=False)
+                self._replace(key)
+            else:
+                self.t1.popitem(last=False)
+        elif len(self.t1) + len(self.t2) + len(self.b1) + len(self.b2) >= c:
+            if len(self.t1) + len(self.t2) + len(self.b1) + len(self.b2) >= 2 * c:
+                self.b2.popitem(last=False)
+            self._replace(key)
+        self.t1[key] = value
+
+    def __len__(self):
+        return len(self.t1) + len(self.t2)
+
+    def _replace(self, key):
+        if len(self.t1) + len(self.t2) < self.capacity:
+            return
+        if self.t1 and (len(self.t1) > self.p or (key in self.b2 and len(self.t1) == self.p)):
+            old_key, _ = self.t1.popitem(last=False)
+            self.b1[old_key] = None
+        else:
+            old_key, _ = self.t2.popitem(last=False)
+            self.b2[old_key] = None
+
+
+def replay_trace(cache, trace):
+    """Replay a recorded key trace (read-through: put on miss); return hit ratio and ops/sec."""
+    hits = 0
+    ops = 0
+    start = time.perf_counter()
+    for key in trace:
+        if cache.get(key) is None:
+            cache.put(key, True)
+        else:
+            hits += 1
+        ops += 1
+    elapsed = time.perf_counter() - start
+    return {"hit_ratio": hits / ops if ops else 0.0, "ops_per_sec": ops / elapsed if elapsed else 0.0}
+
+
+def _bytes_per_entry(cache_cls, n):
+    tracemalloc.start()
+    cache = cache_cls(n)
+    for i in range(n):
+        cache.put(i, i)
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return used / n
+
+
+if __name__ == "__main__":
+    n = 200_000
+    print("Memory per entry:")
+    for cls in (LRUCache, ArrayLRUCache):
+        print(f"  {cls.__name__}: {_bytes_per_entry(cls, n):.1f} bytes")
+
+    rng = random.Random(42)
+    # A 500-key hot set, then a long scan of one-off keys with a hot access
+    # between every two scan keys, then the hot set alone again.
+    hot = range(500)
+    trace = [rng.choice(hot) for _ in range(100_000)]
+    for i in range(100_000):
+        trace += [rng.choice(hot), 10**6 + 2 * i, 10**6 + 2 * i + 1]
+    trace += [rng.choice(hot) for _ in range(100_000)]
+    print("Hit ratio on a 500-key hot set interrupted by a 200k-key scan (capacity 1000, best possible ~0.599):")
+    for cls in (LRUCache, WTinyLFUCache, TwoQueueCache, ARCCache):
+        result = replay_trace(cls(1000), trace)
+        print(f"  {cls.__name__}: {result['hit_ratio']:.3f} hit ratio, {result['ops_per_sec']:,.0f} ops/sec")
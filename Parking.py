@@ -1,4 +1,10 @@
+import random
+import sys
+import time
+import tracemalloc
+from abc import ABC
 from enum import Enum
+from threading import Barrier, Thread
 class VehicleType(Enum):
     CAR = 1
     MOTORCYCLE = 2
@@ -9,6 +15,9 @@ class Vehicle(ABC):
         self.license_plate = license_plate
         self.type = vehicle_type
 
+    def get_type(self) -> VehicleType:
+        return self.type
+
 #each of below class imports same things
 class Truck(Vehicle):
     def __init__(self, license_plate: str):
@@ -23,10 +32,12 @@ class Motorcycle(Vehicle):
         super().__init__(license_plate, VehicleType.MOTORCYCLE)
 
 
-class ParkingSpot(Vehicle, VehicleType):
-    def __init__(self, spot_number: int):
+class ParkingSpot:
+    def __init__(self, spot_number: int, vehicle_type: VehicleType = VehicleType.CAR, cost: float = None):
         self.spot_number = spot_number
-        self.vehicle_type = VehicleType.CAR  # Default vehicle type is CAR
+        self.vehicle_type = vehicle_type
+        # distance to the entrance/elevator; lower is handed out first
+        self.cost = spot_number if cost is None else cost
         self.parked_vehicle = None
 
     def is_available(self) -> bool:
@@ -49,31 +60,124 @@ class ParkingSpot(Vehicle, VehicleType):
     def get_parked_vehicle(self) -> Vehicle:
         return self.parked_vehicle
 
-from typing import List
+import heapq
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple
 
 class Level(ParkingSpot, Vehicle):
-    def __init__(self, floor: int, num_spots: int):
+    """A floor of spots with a free-spot min-heap per VehicleType and a plate -> spot index,
+    so parking hands out the cheapest free spot in O(log n) and unparking needs no scan.
+
+    spot_costs gives each spot's distance to the entrance/elevator and
+    defaults to the spot number, which keeps the old lowest-number-first order.
+    Each level has its own lock, so gates allocating on different levels
+    never wait on each other.
+    """
+    def __init__(self, floor: int, num_spots: int, spot_types: Optional[Sequence[VehicleType]] = None,
+                 spot_costs: Optional[Sequence[float]] = None):
         self.floor = floor
-        self.parking_spots: List[ParkingSpot] = [ParkingSpot(i) for i in range(num_spots)]
+        spot_types = spot_types or [VehicleType.CAR] * num_spots
+        self.parking_spots: List[ParkingSpot] = [
+            ParkingSpot(i, spot_types[i], spot_costs[i] if spot_costs else None) for i in range(num_spots)]
+        self.free_spots: Dict[VehicleType, List[Tuple[float, int]]] = {vehicle_type: [] for vehicle_type in VehicleType}
+        for spot in self.parking_spots:
+            self.free_spots[spot.get_vehicle_type()].append((spot.cost, spot.spot_number))
+        for pool in self.free_spots.values():
+            heapq.heapify(pool)
+        self.occupied: Dict[str, ParkingSpot] = {}  # license plate -> spot
+        self.lock = Lock()
 
     def park_vehicle(self, vehicle: Vehicle) -> bool:
-        for spot in self.parking_spots:
-            if spot.is_available() and spot.get_vehicle_type() == vehicle.get_type():
-                spot.park_vehicle(vehicle)
-                return True
-        return False
+        with self.lock:
+            pool = self.free_spots[vehicle.get_type()]
+            if not pool or vehicle.license_plate in self.occupied:
+                return False
+            # Mark the spot before taking it off the pool so a failed mark leaves the pool intact.
+            spot = self.parking_spots[pool[0][1]]
+            spot.park_vehicle(vehicle)
+            heapq.heappop(pool)
+            self.occupied[vehicle.license_plate] = spot
+            return True
 
     def unpark_vehicle(self, vehicle: Vehicle) -> bool:
-        for spot in self.parking_spots:
-            if not spot.is_available() and spot.get_parked_vehicle() == vehicle:
-                spot.unpark_vehicle()
-                return True
-        return False
+        with self.lock:
+            spot = self.occupied.pop(vehicle.license_plate, None)
+            if spot is None:
+                return False
+            spot.unpark_vehicle()
+            heapq.heappush(self.free_spots[spot.get_vehicle_type()], (spot.cost, spot.spot_number))
+            return True
+
+    def free_count(self, vehicle_type: VehicleType) -> int:
+        return len(self.free_spots[vehicle_type])
     
-from typing import List
+import heapq
+from array import array
+from threading import Lock
+from typing import Dict, List, Optional, Sequence
+
+class CompactLevel:
+    """A Level that stores occupancy in typed arrays indexed by spot number
+    instead of one ParkingSpot object per spot.
+
+    Spot types live in a bytearray and plates in a flat list. Spots are
+    ranked once by cost, and each VehicleType keeps a min-heap of the free
+    spots' ranks, so parking hands out the cheapest spot in O(log n) and
+    free_count stays O(1) at a fraction of Level's memory.
+    """
+    def __init__(self, floor: int, num_spots: int, spot_types: Optional[Sequence[VehicleType]] = None,
+                 spot_costs: Optional[Sequence[float]] = None):
+        self.floor = floor
+        self.num_spots = num_spots
+        spot_types = spot_types or [VehicleType.CAR] * num_spots
+        self.types = bytearray(vehicle_type.value for vehicle_type in spot_types)
+        self.plates: List[Optional[str]] = [None] * num_spots
+        # by_rank[r] is the r-th cheapest spot, rank[spot] its position in that order.
+        if spot_costs:
+            self.by_rank = array('i', sorted(range(num_spots), key=lambda spot_number: (spot_costs[spot_number], spot_number)))
+        else:
+            self.by_rank = array('i', range(num_spots))
+        self.rank = array('i', bytes(4 * num_spots))
+        for r, spot_number in enumerate(self.by_rank):
+            self.rank[spot_number] = r
+        # Ranks are appended in increasing order, so each pool is already a valid heap.
+        self.free_spots: Dict[VehicleType, List[int]] = {vehicle_type: [] for vehicle_type in VehicleType}
+        for r, spot_number in enumerate(self.by_rank):
+            self.free_spots[spot_types[spot_number]].append(r)
+        self.occupied: Dict[str, int] = {}  # license plate -> spot number
+        self.lock = Lock()
+
+    def park_vehicle(self, vehicle: Vehicle) -> bool:
+        with self.lock:
+            pool = self.free_spots[vehicle.get_type()]
+            if not pool or vehicle.license_plate in self.occupied:
+                return False
+            spot_number = self.by_rank[heapq.heappop(pool)]
+            self.plates[spot_number] = vehicle.license_plate
+            self.occupied[vehicle.license_plate] = spot_number
+            return True
+
+    def unpark_vehicle(self, vehicle: Vehicle) -> bool:
+        with self.lock:
+            spot_number = self.occupied.pop(vehicle.license_plate, None)
+            if spot_number is None:
+                return False
+            self.plates[spot_number] = None
+            heapq.heappush(self.free_spots[VehicleType(self.types[spot_number])], self.rank[spot_number])
+            return True
+
+    def free_count(self, vehicle_type: VehicleType) -> int:
+        return len(self.free_spots[vehicle_type])
+
+    def spot_of(self, license_plate: str) -> Optional[int]:
+        return self.occupied.get(license_plate)
+
+from threading import Lock
+from typing import Dict, List
 
 class ParkingLot(Level, Vehicle):
     _instance = None
+    _instance_lock = Lock()
 
     def __init__(self):
         if ParkingLot._instance is not None:
@@ -81,21 +185,267 @@ class ParkingLot(Level, Vehicle):
         else:
             ParkingLot._instance = self
             self.levels: List[Level] = []
+            self.level_of: Dict[str, Optional[Level]] = {}  # plate -> level, None while a park is in flight
+            self._plates_lock = Lock()
 
     @staticmethod
     def get_instance():
         if ParkingLot._instance is None:
-            ParkingLot()
+            with ParkingLot._instance_lock:
+                if ParkingLot._instance is None:
+                    ParkingLot()
         return ParkingLot._instance
 
-    def park_vehicle(self, vehicle: Vehicle) -> bool:
-        for level in self.levels:
-            if level.park_vehicle(vehicle):
+    def set_levels(self, levels: List[Level]):
+        with self._plates_lock:
+            self.levels = levels
+            self.level_of = {}
+
+    def park_vehicle(self, vehicle: Vehicle, start_level: int = 0) -> bool:
+        """Parks on the first level with a free spot, trying start_level first.
+
+        The plate is claimed lot-wide first, so one vehicle cannot be parked
+        by two gates at once. Gates pass their own level as start_level so
+        they only meet other gates' locks once their own level is full. The
+        free-count check is an unlocked hint; the level re-checks under its lock.
+        """
+        plate = vehicle.license_plate
+        with self._plates_lock:
+            if plate in self.level_of:
+                return False  # already parked, or being parked by another gate
+            self.level_of[plate] = None
+        num_levels = len(self.levels)
+        for i in range(num_levels):
+            level = self.levels[(start_level + i) % num_levels]
+            if level.free_count(vehicle.get_type()) and level.park_vehicle(vehicle):
+                with self._plates_lock:
+                    self.level_of[plate] = level
                 return True
+        with self._plates_lock:
+            del self.level_of[plate]
         return False
 
     def unpark_vehicle(self, vehicle: Vehicle) -> bool:
-        for level in self.levels:
-            if level.unpark_vehicle(vehicle):
-                return True
+        plate = vehicle.license_plate
+        level = self.level_of.get(plate)
+        if level is None or not level.unpark_vehicle(vehicle):
+            return False
+        with self._plates_lock:
+            del self.level_of[plate]
+        return True
+
+    def availability(self) -> Dict[int, Dict[VehicleType, int]]:
+        """Free spots per floor and VehicleType, read from each level's running counts."""
+        return {level.floor: {vehicle_type: level.free_count(vehicle_type) for vehicle_type in VehicleType}
+                for level in self.levels}
+
+
+def benchmark_parking(num_levels=10, spots_per_level=10_000, operations=100_000, seed=1):
+    """Times random park/unpark operations on the indexed lot against the old linear scans."""
+    rng = random.Random(seed)
+    kinds = [(Car, VehicleType.CAR), (Motorcycle, VehicleType.MOTORCYCLE), (Truck, VehicleType.TRUCK)]
+    spot_types = [kinds[i % 3][1] for i in range(spots_per_level)]
+    lot = ParkingLot.get_instance()
+    lot.set_levels([Level(floor, spots_per_level, spot_types) for floor in range(num_levels)])
+    vehicles = [rng.choice(kinds)[0](f"PLATE-{i}") for i in range(num_levels * spots_per_level // 2)]
+    # Half-fill the lot so parks and unparks both have real work to do.
+    for vehicle in vehicles[::2]:
+        lot.park_vehicle(vehicle)
+    parked = set(vehicles[::2])
+
+    def scan_park(vehicle):
+        for level in lot.levels:
+            for spot in level.parking_spots:
+                if spot.is_available() and spot.get_vehicle_type() == vehicle.get_type():
+                    return True
         return False
+
+    def scan_unpark(vehicle):
+        for level in lot.levels:
+            for spot in level.parking_spots:
+                if not spot.is_available() and spot.get_parked_vehicle() == vehicle:
+                    return True
+        return False
+
+    sample = [rng.choice(vehicles) for _ in range(operations)]
+    start = time.perf_counter()
+    for vehicle in sample:
+        if vehicle in parked:
+            lot.unpark_vehicle(vehicle)
+            parked.discard(vehicle)
+        elif lot.park_vehicle(vehicle):
+            parked.add(vehicle)
+    indexed = operations / (time.perf_counter() - start)
+
+    scan_ops = min(operations, 200)
+    start = time.perf_counter()
+    for vehicle in sample[:scan_ops]:
+        scan_unpark(vehicle) if vehicle in parked else scan_park(vehicle)
+    scan = scan_ops / (time.perf_counter() - start)
+    print(f"{num_levels} levels x {spots_per_level:,} spots: indexed {indexed:,.0f} ops/s "
+          f"({operations:,} ops), linear scan {scan:,.0f} ops/s")
+
+
+def _run_gates(num_gates, gate):
+    """Runs gate(gate_id) on num_gates threads with the race window around spot allocation widened.
+
+    Every ParkingSpot.park_vehicle first yields to another thread, so a level
+    that picked a spot without holding its lock would hand it out twice.
+    Re-raises the first error any gate hit.
+    """
+    errors = []
+
+    def run(gate_id):
+        try:
+            gate(gate_id)
+        except Exception as e:
+            errors.append(e)
+
+    def slow_park(spot, vehicle):
+        time.sleep(0)
+        park_spot(spot, vehicle)
+
+    park_spot = ParkingSpot.park_vehicle
+    ParkingSpot.park_vehicle = slow_park
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        gates = [Thread(target=run, args=(gate_id,)) for gate_id in range(num_gates)]
+        for thread in gates:
+            thread.start()
+        for thread in gates:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+        ParkingSpot.park_vehicle = park_spot
+    assert not errors, errors
+
+
+def stress_test_gates(num_gates=32, num_levels=4, spots_per_level=64, rounds=3_000, seed=1):
+    """Hammers the lot from num_gates threads and checks no spot was ever handed out twice.
+
+    Raises AssertionError if the gates' own bookkeeping disagrees with the
+    lot: a double allocation would leave two gates believing they parked in
+    the same spot.
+    """
+    lot = ParkingLot.get_instance()
+    lot.set_levels([Level(floor, spots_per_level) for floor in range(num_levels)])
+    parked_by_gate = [set() for _ in range(num_gates)]
+
+    def gate(gate_id):
+        rng = random.Random(seed + gate_id)
+        cars = [Car(f"G{gate_id}-{i}") for i in range(spots_per_level)]
+        parked = parked_by_gate[gate_id]
+        for _ in range(rounds):
+            car = rng.choice(cars)
+            if car in parked:
+                assert lot.unpark_vehicle(car), f"{car.license_plate} vanished"
+                parked.discard(car)
+            elif lot.park_vehicle(car, start_level=gate_id % num_levels):
+                parked.add(car)
+
+    _run_gates(num_gates, gate)
+    expected = {car for parked in parked_by_gate for car in parked}
+    in_spots = [spot.get_parked_vehicle() for level in lot.levels for spot in level.parking_spots
+                if not spot.is_available()]
+    assert len(in_spots) == len(set(in_spots)) == len(expected), "a spot was allocated twice"
+    assert set(in_spots) == expected, "lot and gates disagree about parked vehicles"
+    for level in lot.levels:
+        assert level.free_count(VehicleType.CAR) + len(level.occupied) == spots_per_level
+    print(f"{num_gates} gates x {rounds:,} operations: no double allocation, {len(expected)} vehicles parked")
+
+
+def stress_test_same_plate(num_gates=4, num_levels=4, trials=200):
+    """Has num_gates gates park the same car at once, trials times, and checks it lands in exactly one spot."""
+    lot = ParkingLot.get_instance()
+    lot.set_levels([Level(floor, 16) for floor in range(num_levels)])
+    for trial in range(trials):
+        car = Car(f"CONTESTED-{trial}")
+        arrived = Barrier(num_gates)
+        parked = [False] * num_gates
+
+        def gate(gate_id):
+            arrived.wait()
+            parked[gate_id] = lot.park_vehicle(car, start_level=gate_id % num_levels)
+
+        _run_gates(num_gates, gate)
+        spots = sum(spot.get_parked_vehicle() is car for level in lot.levels for spot in level.parking_spots
+                    if not spot.is_available())
+        assert sum(parked) == spots == 1, f"trial {trial}: {sum(parked)} gates parked {car.license_plate} in {spots} spots"
+        assert lot.unpark_vehicle(car) and not lot.level_of
+    print(f"{trials} trials of {num_gates} gates parking one car: always exactly one spot")
+
+
+def compare_level_memory(num_spots=100_000):
+    """Measures the memory of a Level against a CompactLevel holding the same spots."""
+    spot_types = [list(VehicleType)[i % 3] for i in range(num_spots)]
+    results = {}
+    for level_cls in (Level, CompactLevel):
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        level = level_cls(0, num_spots, spot_types)
+        results[level_cls.__name__] = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        del level
+    print(f"{num_spots:,} spots: Level {results['Level'] / num_spots:.0f} B/spot, "
+          f"CompactLevel {results['CompactLevel'] / num_spots:.0f} B/spot")
+
+    lot = ParkingLot.get_instance()
+    lot.set_levels([CompactLevel(floor, num_spots // 4, spot_types) for floor in range(4)])
+    for i in range(num_spots // 8):
+        lot.park_vehicle(Car(f"BOARD-{i}"))
+    for floor, counts in lot.availability().items():
+        print(f"  level {floor}: " + ", ".join(f"{t.name} {n:,}" for t, n in counts.items()))
+
+
+def benchmark_nearest_spot(spots_per_level=50_000, operations=20_000, seed=1):
+    """Times cheapest-spot allocation from the per-type heaps against a linear scan for the
+    cheapest free spot, on one level with random distance costs."""
+    rng = random.Random(seed)
+    kinds = [(Car, VehicleType.CAR), (Motorcycle, VehicleType.MOTORCYCLE), (Truck, VehicleType.TRUCK)]
+    spot_types = [kinds[i % 3][1] for i in range(spots_per_level)]
+    spot_costs = [rng.uniform(0, 200) for _ in range(spots_per_level)]
+    level = Level(0, spots_per_level, spot_types, spot_costs)
+    vehicles = [rng.choice(kinds)[0](f"NEAR-{i}") for i in range(spots_per_level)]
+    for vehicle in vehicles[::2]:
+        level.park_vehicle(vehicle)
+    parked = set(vehicles[::2])
+
+    def scan_cheapest(vehicle_type):
+        best = None
+        for spot in level.parking_spots:
+            if spot.is_available() and spot.get_vehicle_type() == vehicle_type and (best is None or spot.cost < best.cost):
+                best = spot
+        return best
+
+    # Spot check: the heap must hand out exactly the spot the scan would pick.
+    for vehicle in vehicles[1:200:2]:
+        expected = scan_cheapest(vehicle.get_type())
+        level.park_vehicle(vehicle)
+        assert level.occupied[vehicle.license_plate] is expected
+        parked.add(vehicle)
+
+    sample = [rng.choice(vehicles) for _ in range(operations)]
+    start = time.perf_counter()
+    for vehicle in sample:
+        if vehicle in parked:
+            level.unpark_vehicle(vehicle)
+            parked.discard(vehicle)
+        elif level.park_vehicle(vehicle):
+            parked.add(vehicle)
+    heap = operations / (time.perf_counter() - start)
+
+    scan_ops = min(operations, 200)
+    start = time.perf_counter()
+    for vehicle in sample[:scan_ops]:
+        scan_cheapest(vehicle.get_type())
+    scan = scan_ops / (time.perf_counter() - start)
+    print(f"{spots_per_level:,} spots/level nearest-spot: heap {heap:,.0f} ops/s, linear scan {scan:,.0f} ops/s")
+
+
+if __name__ == "__main__":
+    benchmark_parking()
+    stress_test_gates()
+    stress_test_same_plate()
+    compare_level_memory()
+    benchmark_nearest_spot()
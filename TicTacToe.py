@@ -1,35 +1,66 @@
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 class Board:
-    def __init__(self):
-        self.grid = [['-' for _ in range(3)] for _ in range(3)]
+    """An N x N board won by K in a row (3 x 3, three in a row by default).
+
+    make_move checks only the four lines through the placed mark, so win
+    detection costs O(K) per move instead of a full board scan.
+    """
+    DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+    def __init__(self, size=3, win_length=None):
+        self.size = size
+        self.win_length = win_length or size
+        if not 1 <= self.win_length <= size:
+            raise ValueError("win_length must be between 1 and the board size")
+        self.grid = [['-' for _ in range(size)] for _ in range(size)]
         self.moves_count = 0
+        self.winner = None
 
     def make_move(self, row, col, symbol):
-        if not (0 <= row < 3 and 0 <= col < 3) or self.grid[row][col] != '-':
+        if not (0 <= row < self.size and 0 <= col < self.size) or self.grid[row][col] != '-':
             raise ValueError("Invalid move!")
         self.grid[row][col] = symbol
         self.moves_count += 1
+        if self.winner is None and self._completes_line(row, col, symbol):
+            self.winner = symbol
+
+    def _completes_line(self, row, col, symbol):
+        grid, size = self.grid, self.size
+        for d_row, d_col in self.DIRECTIONS:
+            count = 1
+            for sign in (1, -1):
+                r, c = row + sign * d_row, col + sign * d_col
+                while 0 <= r < size and 0 <= c < size and grid[r][c] == symbol:
+                    count += 1
+                    if count >= self.win_length:
+                        return True
+                    r += sign * d_row
+                    c += sign * d_col
+            if count >= self.win_length:
+                return True
+        return False
 
     def is_full(self):
-        return self.moves_count == 9
+        return self.moves_count == self.size * self.size
 
-    def has_winner(self):
-        # Check rows
-        for row in range(3):
-            if self.grid[row][0] != '-' and self.grid[row][0] == self.grid[row][1] == self.grid[row][2]:
-                return True
+    def is_winning_move(self, row, col, symbol):
+        """Whether placing `symbol` on the empty cell (row, col) would win."""
+        return self._completes_line(row, col, symbol)
 
-        # Check columns
-        for col in range(3):
-            if self.grid[0][col] != '-' and self.grid[0][col] == self.grid[1][col] == self.grid[2][col]:
-                return True
+    def empty_cells(self):
+        return [(row, col) for row in range(self.size) for col in range(self.size) if self.grid[row][col] == '-']
 
-        # Check diagonals
-        if self.grid[0][0] != '-' and self.grid[0][0] == self.grid[1][1] == self.grid[2][2]:
-            return True
-        return self.grid[0][2] != '-' and self.grid[0][2] == self.grid[1][1] == self.grid[2][0]
+    def is_empty(self, row, col):
+        return self.grid[row][col] == '-'
+
+    def has_winner(self):
+        return self.winner is not None
 
     def print_board(self):
-        for row in range(3):
+        for row in range(self.size):
             print(" ".join(self.grid[row]))
         print()
 
@@ -46,18 +77,20 @@ class Player:
 
 
 class Game(Board):
-    def __init__(self, player1, player2):
+    def __init__(self, player1, player2, size=3, win_length=None):
         self.player1 = player1
         self.player2 = player2
-        self.board = Board()
+        # The classic game runs on the bitboard; larger boards need the grid.
+        self.board = BitBoard() if size == 3 and win_length in (None, 3) else Board(size, win_length)
         self.current_player = player1
 
     def play(self):
         self.board.print_board()
         while not self.board.is_full() and not self.board.has_winner():
             print(f"{self.current_player.get_name()}'s turn.")
-            row = self.get_valid_input("Enter row (0-2): ")
-            col = self.get_valid_input("Enter column (0-2): ")
+            last = self.board.size - 1
+            row = self.get_valid_input(f"Enter row (0-{last}): ")
+            col = self.get_valid_input(f"Enter column (0-{last}): ")
             try:
                 self.board.make_move(row, col, self.current_player.get_symbol())
                 self.board.print_board()
@@ -71,16 +104,279 @@ class Game(Board):
         else:
             print("It's a draw!")
 
+    def play_headless(self):
+        """Plays to the end using each player's choose_move (see the strategy
+        players below), without input or printing.
+
+        Returns the winning Player, or None for a draw.
+        """
+        board = self.board
+        while not board.is_full():
+            opponent = self.player2 if self.current_player is self.player1 else self.player1
+            row, col = self.current_player.choose_move(board, opponent.get_symbol())
+            board.make_move(row, col, self.current_player.get_symbol())
+            if board.has_winner():
+                return self.current_player
+            self.current_player = opponent
+        return None
+
     def switch_player(self):
         self.current_player = self.player2 if self.current_player == self.player1 else self.player1
 
     def get_valid_input(self, message):
+        last = self.board.size - 1
         while True:
             try:
                 user_input = int(input(message))
-                if 0 <= user_input <= 2:
+                if 0 <= user_input <= last:
                     return user_input
                 else:
-                    print("Invalid input! Please enter a number between 0 and 2.")
+                    print(f"Invalid input! Please enter a number between 0 and {last}.")
             except ValueError:
-                print("Invalid input! Please enter a number between 0 and 2.")
+                print(f"Invalid input! Please enter a number between 0 and {last}.")
+
+
+# Bitboard engine: bit (row * 3 + col) of each mask is set where that player has moved.
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,  # rows
+    0b001001001, 0b010010010, 0b100100100,  # columns
+    0b100010001, 0b001010100,               # diagonals
+)
+CELLS = [divmod(square, 3) for square in range(9)]  # square -> (row, col)
+
+
+def is_win(bits):
+    for mask in WIN_MASKS:
+        if bits & mask == mask:
+            return True
+    return False
+
+
+class BitBoard:
+    """A 3x3 board stored as one 9-bit mask per player, with the same interface as Board.
+
+    The first symbol to move is tracked in masks[0], the second in masks[1].
+    """
+    size = 3
+    win_length = 3
+
+    def __init__(self):
+        self.masks = [0, 0]
+        self.symbols = []
+        self.moves_count = 0
+        self.winner = None
+
+    def make_move(self, row, col, symbol):
+        bit = 1 << (row * 3 + col)
+        if not (0 <= row < 3 and 0 <= col < 3) or (self.masks[0] | self.masks[1]) & bit:
+            raise ValueError("Invalid move!")
+        if symbol not in self.symbols:
+            self.symbols.append(symbol)
+        side = self.symbols.index(symbol)
+        self.masks[side] |= bit
+        self.moves_count += 1
+        if self.winner is None and is_win(self.masks[side]):
+            self.winner = symbol
+
+    def mask_of(self, symbol):
+        return self.masks[self.symbols.index(symbol)] if symbol in self.symbols else 0
+
+    def is_full(self):
+        return self.moves_count == 9
+
+    def is_winning_move(self, row, col, symbol):
+        """Whether placing `symbol` on the empty cell (row, col) would win."""
+        return is_win(self.mask_of(symbol) | 1 << (row * 3 + col))
+
+    def empty_cells(self):
+        occupied = self.masks[0] | self.masks[1]
+        return [CELLS[square] for square in range(9) if not occupied >> square & 1]
+
+    def is_empty(self, row, col):
+        return not (self.masks[0] | self.masks[1]) >> (row * 3 + col) & 1
+
+    def has_winner(self):
+        return self.winner is not None
+
+    def print_board(self):
+        for row in range(3):
+            cells = []
+            for col in range(3):
+                bit = 1 << (row * 3 + col)
+                side = 0 if self.masks[0] & bit else 1 if self.masks[1] & bit else None
+                cells.append('-' if side is None else self.symbols[side])
+            print(" ".join(cells))
+        print()
+
+
+class Solver:
+    """Perfect-play negamax with alpha-beta pruning and a transposition table.
+
+    Scores are from the side to move: positive wins, negative loses, 0 draws;
+    quicker wins (and slower losses) score further from zero.
+    """
+    EXACT, LOWER, UPPER = 0, 1, 2
+    MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)  # centre, corners, edges
+
+    def __init__(self):
+        self.table = {}  # (own << 9 | other) -> (flag, score)
+
+    def negamax(self, own, other, alpha=-10, beta=10):
+        """Score for the player holding `own`, who is to move; `other` just moved."""
+        empty = 9 - (own | other).bit_count()
+        if is_win(other):
+            return -(empty + 1)
+        if not empty:
+            return 0
+        key = own << 9 | other
+        entry = self.table.get(key)
+        if entry is not None:
+            flag, score = entry
+            if flag == self.EXACT:
+                return score
+            if flag == self.LOWER:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if alpha >= beta:
+                return score
+        original_alpha = alpha
+        best = -10
+        occupied = own | other
+        for square in self.MOVE_ORDER:
+            bit = 1 << square
+            if occupied & bit:
+                continue
+            score = -self.negamax(other, own | bit, -beta, -alpha)
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        if best <= original_alpha:
+            flag = self.UPPER
+        elif best >= beta:
+            flag = self.LOWER
+        else:
+            flag = self.EXACT
+        self.table[key] = (flag, best)
+        return best
+
+    def best_move(self, board: BitBoard):
+        """(row, col) of a perfect move for the side to move on `board`."""
+        side = board.moves_count % 2
+        return self.best_move_for(board.masks[side], board.masks[1 - side])
+
+    def best_move_for(self, own, other):
+        """(row, col) of a perfect move for the player holding `own`, who is to move."""
+        occupied = own | other
+        best_square, best_score = None, -11
+        for square in self.MOVE_ORDER:
+            bit = 1 << square
+            if occupied & bit:
+                continue
+            score = -self.negamax(other, own | bit)
+            if score > best_score:
+                best_square, best_score = square, score
+        if best_square is None:
+            raise ValueError("No moves left!")
+        return divmod(best_square, 3)
+
+
+# Headless self-play: each strategy player implements choose_move(board, opponent_symbol).
+class RandomPlayer(Player):
+    def choose_move(self, board, opponent_symbol):
+        return random.choice(board.empty_cells())
+
+
+class HeuristicPlayer(Player):
+    """Wins if it can, otherwise blocks, otherwise prefers the centre, then a random cell."""
+    def choose_move(self, board, opponent_symbol):
+        cells = board.empty_cells()
+        for symbol in (self.symbol, opponent_symbol):
+            for row, col in cells:
+                if board.is_winning_move(row, col, symbol):
+                    return row, col
+        centre = (board.size // 2, board.size // 2)
+        if board.is_empty(*centre):
+            return centre
+        return random.choice(cells)
+
+
+class SolverPlayer(Player):
+    """Perfect play on the classic 3x3 board, via the bitboard Solver."""
+    solver = Solver()  # shared so the transposition table is reused across games
+
+    def choose_move(self, board, opponent_symbol):
+        if not isinstance(board, BitBoard):
+            raise ValueError("SolverPlayer only plays 3x3, three in a row")
+        return self.solver.best_move_for(board.mask_of(self.symbol), board.mask_of(opponent_symbol))
+
+
+STRATEGIES = {"random": RandomPlayer, "heuristic": HeuristicPlayer, "solver": SolverPlayer}
+
+
+def _play_batch(strategy1, strategy2, games, size, win_length, seed):
+    random.seed(seed)
+    player1 = STRATEGIES[strategy1]("Player 1", "X")
+    player2 = STRATEGIES[strategy2]("Player 2", "O")
+    results = [0, 0, 0]  # player 1 wins, player 2 wins, draws
+    for _ in range(games):
+        winner = Game(player1, player2, size, win_length).play_headless()
+        results[0 if winner is player1 else 1 if winner is player2 else 2] += 1
+    return results
+
+
+def run_self_play(strategy1, strategy2, games, size=3, win_length=None, processes=None, batch_size=5_000):
+    """Plays `games` headless games between two named STRATEGIES on a process pool.
+
+    Returns win/draw counts and games per second.
+    """
+    batches = [min(batch_size, games - start) for start in range(0, games, batch_size)]
+    start = time.perf_counter()
+    totals = [0, 0, 0]
+    with ProcessPoolExecutor(processes) as pool:
+        futures = [pool.submit(_play_batch, strategy1, strategy2, batch, size, win_length, seed)
+                   for seed, batch in enumerate(batches)]
+        for future in futures:
+            for i, count in enumerate(future.result()):
+                totals[i] += count
+    elapsed = time.perf_counter() - start
+    return {"player1_wins": totals[0], "player2_wins": totals[1], "draws": totals[2],
+            "games_per_sec": games / elapsed if elapsed else 0.0}
+
+
+def benchmark_board_sizes(sizes=(3, 10, 19, 50, 100), games=20, win_length=5):
+    """Plays random games to a win or a full board and reports the cost per move."""
+    for size in sizes:
+        k = min(win_length, size)
+        cells = [(row, col) for row in range(size) for col in range(size)]
+        moves = 0
+        start = time.perf_counter()
+        for _ in range(games):
+            random.shuffle(cells)
+            board = Board(size, k)
+            for turn, (row, col) in enumerate(cells):
+                board.make_move(row, col, 'XO'[turn % 2])
+                if board.has_winner():
+                    break
+            moves += board.moves_count
+        elapsed = time.perf_counter() - start
+        print(f"{size}x{size}, {k} in a row: {games / elapsed:,.0f} games/s, "
+              f"{elapsed / moves * 1e6:.2f} us/move over {moves / games:.0f} moves/game")
+
+
+if __name__ == "__main__":
+    benchmark_board_sizes()
+    start = time.perf_counter()
+    solver = Solver()
+    score = solver.negamax(0, 0)
+    print(f"Solved the full game tree in {(time.perf_counter() - start) * 1000:.1f} ms: "
+          f"{'draw' if score == 0 else 'first player wins' if score > 0 else 'second player wins'} "
+          f"with perfect play, {len(solver.table)} positions cached")
+
+    for strategy1, strategy2 in (("random", "random"), ("heuristic", "random"), ("solver", "heuristic")):
+        stats = run_self_play(strategy1, strategy2, 200_000)
+        print(f"{strategy1} vs {strategy2}: {stats['player1_wins']} / {stats['player2_wins']} / "
+              f"{stats['draws']} (wins / losses / draws), {stats['games_per_sec']:,.0f} games/s")
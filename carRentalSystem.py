@@ -1,4 +1,55 @@
-from datetime import datetime
+import heapq
+import random
+import sys
+import time
+from bisect import bisect_left, bisect_right, insort
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import count, islice
+from threading import Lock
+
+class ReservationCalendar:
+    """The bookings of one vehicle as non-overlapping [start, end) intervals kept sorted by start.
+
+    Because intervals never overlap, only the neighbours of a new interval can
+    clash with it, so overlap checks are two bisects and a comparison.
+    """
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.reservations = []
+
+    def is_free(self, start_date, end_date):
+        i = bisect_right(self.starts, start_date)
+        if i and self.ends[i - 1] > start_date:
+            return False
+        return i == len(self.starts) or self.starts[i] >= end_date
+
+    def book(self, start_date, end_date, reservation):
+        if not self.is_free(start_date, end_date):
+            return False
+        i = bisect_right(self.starts, start_date)
+        self.starts.insert(i, start_date)
+        self.ends.insert(i, end_date)
+        self.reservations.insert(i, reservation)
+        return True
+
+    def cancel(self, reservation):
+        i = bisect_right(self.starts, reservation.start_date) - 1
+        if i < 0 or self.reservations[i] is not reservation:
+            return False
+        del self.starts[i], self.ends[i], self.reservations[i]
+        return True
+
+    def end_early(self, reservation, moment):
+        """Frees the rest of a booking that is under way at moment."""
+        i = bisect_right(self.starts, reservation.start_date) - 1
+        if i >= 0 and self.reservations[i] is reservation and self.starts[i] <= moment < self.ends[i]:
+            self.ends[i] = moment
+
+    def __len__(self):
+        return len(self.starts)
 
 class Vehicle:
     """Represents a vehicle in the rental system."""
@@ -8,7 +59,18 @@ class Vehicle:
         self.model = model
         self.year = year
         self.daily_rate = daily_rate
-        self.is_available = True
+        self.calendar = ReservationCalendar()
+        self.lock = Lock()  # guards calendar
+
+    def is_free(self, start_date, end_date):
+        """True if no booking overlaps [start_date, end_date); an empty window asks about that instant."""
+        with self.lock:
+            return self.calendar.is_free(start_date, end_date)
+
+    @property
+    def is_available(self):
+        now = datetime.now()
+        return self.is_free(now, now)
 
 class User:
     """Represents a user of the rental system."""
@@ -22,13 +84,21 @@ class Store:
         self.store_id = store_id
         self.location = location
         self.vehicles = []
+        self.search_index = None  # set by CarRentalSystem.add_store
 
     def add_vehicle(self, vehicle: Vehicle):
         self.vehicles.append(vehicle)
+        if self.search_index is not None:
+            self.search_index.add_vehicle(self, vehicle)
 
     def get_available_vehicles(self):
+        if self.search_index is not None:
+            return list(self.search_index.search(store_id=self.store_id))
         return [v for v in self.vehicles if v.is_available]
 
+    def get_vehicles_free_between(self, start_date, end_date):
+        return [v for v in self.vehicles if v.is_free(start_date, end_date)]
+
 class Reservation:
     """Represents a vehicle reservation."""
     def __init__(self, reservation_id, user: User, vehicle: Vehicle, start_date, end_date):
@@ -39,40 +109,376 @@ class Reservation:
         self.end_date = end_date
         self.total_cost = (end_date - start_date).days * vehicle.daily_rate
 
-class CarRentalSystem:
-    """The main class to manage the car rental operations."""
+@lru_cache(maxsize=1 << 16)
+def normalize(text):
+    return " ".join(str(text).split()).casefold()
+
+class PostingList:
+    """(daily_rate, vehicle_id) entries kept sorted in blocks of BLOCK to 2 * BLOCK entries.
+
+    An insert bisects the block maxima and shifts one block, so it never moves
+    the whole list. Splitting a block swaps in new blocks and maxes lists
+    instead of editing them in place, so a reader never sees them shrink.
+    """
+    BLOCK = 512
+
     def __init__(self):
+        self.blocks = []
+        self.maxes = []  # last entry of each block
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def add(self, entry):
+        blocks, maxes = self.blocks, self.maxes
+        if not blocks:
+            self.blocks, self.maxes = [[entry]], [entry]
+        else:
+            i = min(bisect_left(maxes, entry), len(maxes) - 1)
+            block = blocks[i]
+            insort(block, entry)
+            maxes[i] = block[-1]
+            if len(block) > 2 * self.BLOCK:
+                half = self.BLOCK
+                self.blocks = blocks[:i] + [block[:half], block[half:]] + blocks[i + 1:]
+                self.maxes = maxes[:i] + [block[half - 1], block[-1]] + maxes[i + 1:]
+        self.size += 1
+
+    def extend(self, entries):
+        """Adds a batch, rebuilding the blocks from one sort when the batch is large."""
+        if len(entries) * 16 < self.size:
+            for entry in entries:
+                self.add(entry)
+            return
+        merged = [entry for block in self.blocks for entry in block]
+        merged.extend(entries)
+        merged.sort()
+        blocks = [merged[i:i + self.BLOCK] for i in range(0, len(merged), self.BLOCK)]
+        self.blocks, self.maxes = blocks, [block[-1] for block in blocks]
+        self.size = len(merged)
+
+    def irange(self, min_rate=None, max_rate=None):
+        """Yields the entries with min_rate <= daily_rate <= max_rate, cheapest first."""
+        blocks = self.blocks
+        i = 0 if min_rate is None else bisect_left(self.maxes, (min_rate,))
+        for block in islice(blocks, i, None):
+            start = 0 if min_rate is None else bisect_left(block, (min_rate,))
+            for entry in block[start:]:
+                if max_rate is not None and entry[0] > max_rate:
+                    return
+                yield entry
+
+class VehicleSearchIndex:
+    """Indexes vehicles by location, store, make, model and year.
+
+    Every index key maps to a PostingList of (daily_rate, vehicle_id), so
+    each list doubles as a price index. There is no single list of every
+    vehicle: unfiltered searches merge ALL_SHARDS smaller ones. A search walks the
+    shortest posting list among its filters over the requested price range,
+    checks the remaining filters and the vehicle's calendar per vehicle, and
+    pages lazily. Availability is read from the calendars at search time, so
+    bookings never touch the index.
+
+    Updates take the index lock; searches do not, so a search racing an
+    update may skip or repeat an entry but never fails.
+    """
+    ALL_SHARDS = 16
+
+    def __init__(self):
+        self.lock = Lock()
+        self.postings = {}
+        self.vehicles = {}  # vehicle_id -> vehicle, for every indexed vehicle
+        self.store_of = {}  # vehicle_id -> store
+        self.stores_by_location = {}  # normalized location -> stores
+
+    def add_stores(self, stores):
+        """Indexes many stores at once, updating each posting list they touch once."""
+        with self.lock:
+            added = {}
+            for store in stores:
+                self.stores_by_location.setdefault(normalize(store.location), []).append(store)
+                for vehicle in store.vehicles:
+                    self.vehicles[vehicle.vehicle_id] = vehicle
+                    self.store_of[vehicle.vehicle_id] = store
+                    entry = (vehicle.daily_rate, vehicle.vehicle_id)
+                    for key in self._keys(vehicle):
+                        added.setdefault(key, []).append(entry)
+            for key, entries in added.items():
+                self.postings.setdefault(key, PostingList()).extend(entries)
+
+    def add_vehicle(self, store, vehicle):
+        with self.lock:
+            self.vehicles[vehicle.vehicle_id] = vehicle
+            self.store_of[vehicle.vehicle_id] = store
+            self._insert(vehicle)
+
+    def _keys(self, vehicle):
+        store = self.store_of[vehicle.vehicle_id]
+        return (("all", hash(vehicle.vehicle_id) % self.ALL_SHARDS), ("location", normalize(store.location)),
+                ("store", store.store_id),
+                ("make", normalize(vehicle.make)), ("model", normalize(vehicle.model)), ("year", vehicle.year))
+
+    _fields = {
+        "location": lambda self, vehicle: normalize(self.store_of[vehicle.vehicle_id].location),
+        "store": lambda self, vehicle: self.store_of[vehicle.vehicle_id].store_id,
+        "make": lambda self, vehicle: normalize(vehicle.make),
+        "model": lambda self, vehicle: normalize(vehicle.model),
+        "year": lambda self, vehicle: vehicle.year,
+    }
+
+    def _insert(self, vehicle):
+        entry = (vehicle.daily_rate, vehicle.vehicle_id)
+        for key in self._keys(vehicle):
+            self.postings.setdefault(key, PostingList()).add(entry)
+
+    def search(self, location=None, store_id=None, make=None, model=None, year=None,
+               min_rate=None, max_rate=None, start_date=None, end_date=None, offset=0, limit=None):
+        """Yields vehicles matching every given filter and free from start_date to end_date, cheapest first.
+
+        Without dates, vehicles free right now are returned. offset and limit
+        page through the results without building the full list.
+        """
+        if start_date is None:
+            start_date = end_date = datetime.now()
+        filters = [("location", normalize(location) if location is not None else None), ("store", store_id),
+                   ("make", normalize(make) if make is not None else None),
+                   ("model", normalize(model) if model is not None else None), ("year", year)]
+        keys = [(field, value) for field, value in filters if value is not None]
+        if keys:
+            postings = [self.postings.get(key, PostingList()) for key in keys]
+            driver = min(postings, key=len)
+            others = [key for key, posting in zip(keys, postings) if posting is not driver]
+            entries = driver.irange(min_rate, max_rate)
+        else:
+            others = []
+            entries = heapq.merge(*(self.postings[("all", shard)].irange(min_rate, max_rate)
+                                    for shard in range(self.ALL_SHARDS) if ("all", shard) in self.postings))
+        checks = [(self._fields[field], value) for field, value in others]
+
+        def matches():
+            vehicles = self.vehicles
+            for _, vehicle_id in entries:
+                vehicle = vehicles[vehicle_id]
+                for get, value in checks:
+                    if get(self, vehicle) != value:
+                        break
+                else:
+                    if vehicle.is_free(start_date, end_date):
+                        yield vehicle
+
+        return islice(matches(), offset, None if limit is None else offset + limit)
+
+class CarRentalSystem:
+    """The main class to manage the car rental operations.
+
+    Reservations on one vehicle serialize on that vehicle's lock, so bookings
+    of different vehicles never wait on each other, and reservation IDs come
+    from an itertools.count, whose next() is atomic.
+    """
+    def __init__(self, verbose=True):
         self.users = []
         self.stores = []
         self.reservations = []
-        self._next_reservation_id = 1
+        self._reservation_ids = count(1)
+        self.search_index = VehicleSearchIndex()
+        self.verbose = verbose
 
     def add_user(self, user: User):
         self.users.append(user)
 
     def add_store(self, store: Store):
-        self.stores.append(store)
+        self.add_stores([store])
+
+    def add_stores(self, stores):
+        stores = list(stores)
+        self.stores.extend(stores)
+        for store in stores:
+            store.search_index = self.search_index
+        self.search_index.add_stores(stores)
 
     def search_vehicle(self, store_location):
-        for store in self.stores:
-            if store.location.lower() == store_location.lower():
-                return store.get_available_vehicles()
-        return []
+        stores = self.search_index.stores_by_location.get(normalize(store_location))
+        return stores[0].get_available_vehicles() if stores else []
+
+    def search(self, **filters):
+        """Pages through free vehicles; see VehicleSearchIndex.search for the filters."""
+        return self.search_index.search(**filters)
 
     def make_reservation(self, user: User, vehicle: Vehicle, start_date, end_date):
-        if not vehicle.is_available:
-            print("Vehicle is not available for the selected dates.")
+        if end_date <= start_date:
+            if self.verbose:
+                print("The end date must come after the start date.")
             return None
-
-        vehicle.is_available = False
-        reservation = Reservation(self._next_reservation_id, user, vehicle, start_date, end_date)
+        with vehicle.lock:
+            if not vehicle.calendar.is_free(start_date, end_date):
+                if self.verbose:
+                    print("Vehicle is not available for the selected dates.")
+                return None
+            reservation = Reservation(next(self._reservation_ids), user, vehicle, start_date, end_date)
+            vehicle.calendar.book(start_date, end_date, reservation)
         self.reservations.append(reservation)
-        self._next_reservation_id += 1
         return reservation
 
     def return_vehicle(self, reservation: Reservation):
-        reservation.vehicle.is_available = True
-        print(f"Vehicle {reservation.vehicle.vehicle_id} has been returned.")
+        with reservation.vehicle.lock:
+            reservation.vehicle.calendar.end_early(reservation, datetime.now())
+        if self.verbose:
+            print(f"Vehicle {reservation.vehicle.vehicle_id} has been returned.")
+
+    def cancel_reservation(self, reservation: Reservation):
+        with reservation.vehicle.lock:
+            if not reservation.vehicle.calendar.cancel(reservation):
+                return False
+        self.reservations.remove(reservation)
+        return True
+
+
+def benchmark_calendar(num_vehicles=500, years=5, queries=20_000, seed=1):
+    """Times "which cars are free from A to B" on per-vehicle calendars against
+    scanning every reservation for an overlap."""
+    rng = random.Random(seed)
+    system = CarRentalSystem()
+    store = Store(1, "Benchmark")
+    system.add_store(store)
+    user = User(1, "Bench")
+    origin = datetime(2025, 1, 1)
+    for i in range(num_vehicles):
+        vehicle = Vehicle(f"V{i}", "Make", "Model", 2024, 50)
+        store.add_vehicle(vehicle)
+        day = rng.randint(0, 5)
+        while day < 365 * years:
+            length = rng.randint(1, 7)
+            reservation = Reservation(len(system.reservations) + 1, user, vehicle,
+                                      origin + timedelta(days=day), origin + timedelta(days=day + length))
+            vehicle.calendar.book(reservation.start_date, reservation.end_date, reservation)
+            system.reservations.append(reservation)
+            day += length + rng.randint(0, 4)
+
+    windows = []
+    for _ in range(queries):
+        start = origin + timedelta(days=rng.randint(0, 365 * years))
+        windows.append((start, start + timedelta(days=rng.randint(1, 7))))
+
+    start_time = time.perf_counter()
+    free = [store.get_vehicles_free_between(a, b) for a, b in windows]
+    indexed = queries / (time.perf_counter() - start_time)
+
+    def scan(a, b):
+        busy = {r.vehicle for r in system.reservations if r.start_date < b and a < r.end_date}
+        return [v for v in store.vehicles if v not in busy]
+
+    scan_queries = min(queries, 20)
+    start_time = time.perf_counter()
+    for (a, b), expected in zip(windows[:scan_queries], free):
+        assert scan(a, b) == expected
+    scanned = scan_queries / (time.perf_counter() - start_time)
+    print(f"{num_vehicles:,} vehicles, {len(system.reservations):,} bookings over {years} years: "
+          f"calendar {indexed:,.0f} queries/s, reservation scan {scanned:,.1f} queries/s")
+
+
+def benchmark_search(num_stores=10_000, vehicles_per_store=100, queries=2_000, seed=1):
+    """Builds num_stores x vehicles_per_store vehicles, then times indexed searches and
+    reserve/return updates against the old scans."""
+    rng = random.Random(seed)
+    makes = {"Toyota": ["Camry", "Corolla", "RAV4"], "Honda": ["Civic", "CRV", "Accord"],
+             "Ford": ["Focus", "Escape", "F-150"], "Tesla": ["Model 3", "Model Y"]}
+    cities = [f"City {i}" for i in range(num_stores // 4)]
+    start_time = time.perf_counter()
+    stores = []
+    for store_id in range(num_stores):
+        store = Store(store_id, rng.choice(cities))
+        for i in range(vehicles_per_store):
+            make = rng.choice(list(makes))
+            store.vehicles.append(Vehicle(f"S{store_id}-V{i}", make, rng.choice(makes[make]),
+                                          rng.randint(2015, 2025), rng.randint(30, 300)))
+        stores.append(store)
+    system = CarRentalSystem()
+    system.add_stores(stores)
+    print(f"indexed {num_stores:,} stores / {num_stores * vehicles_per_store:,} vehicles "
+          f"in {time.perf_counter() - start_time:.1f}s")
+
+    def scan(location, make, min_rate, max_rate):
+        found = [v for store in system.stores if store.location.lower() == location.lower()
+                 for v in store.vehicles if v.is_available and v.make == make and min_rate <= v.daily_rate <= max_rate]
+        return sorted(found, key=lambda v: (v.daily_rate, v.vehicle_id))[:20]
+
+    workload = [(rng.choice(cities).upper(), rng.choice(list(makes)), 50, rng.randint(80, 300))
+                for _ in range(queries)]
+    start_time = time.perf_counter()
+    results = [list(system.search(location=location, make=make, min_rate=min_rate, max_rate=max_rate, limit=20))
+               for location, make, min_rate, max_rate in workload]
+    indexed = queries / (time.perf_counter() - start_time)
+    start_time = time.perf_counter()
+    for query, expected in zip(workload[:50], results):
+        assert scan(*query) == expected
+    scanned = 50 / (time.perf_counter() - start_time)
+    print(f"location+make+price search, page of 20: indexed {indexed:,.0f} queries/s, scan {scanned:,.0f} queries/s")
+
+    start_time = time.perf_counter()
+    pages = [list(system.search(min_rate=100, max_rate=120, offset=page * 20, limit=20)) for page in range(100)]
+    print(f"price-only search, 100 pages of 20: {time.perf_counter() - start_time:.3f}s "
+          f"({sum(map(len, pages)):,} results)")
+
+    system.verbose = False
+    user = User(1, "Bench")
+    now = datetime.now()
+    vehicles = rng.sample(list(system.search_index.vehicles.values()), 2_000)
+    start_time = time.perf_counter()
+    reservations = [system.make_reservation(user, vehicle, now - timedelta(days=1), now + timedelta(days=1))
+                    for vehicle in vehicles]
+    for reservation in reservations:
+        system.return_vehicle(reservation)
+    updates = 2 * len(vehicles) / (time.perf_counter() - start_time)
+    print(f"reserve/return: {updates:,.0f} operations/s")
+
+    store = system.stores[0]
+    start_time = time.perf_counter()
+    for i in range(2_000):
+        store.add_vehicle(Vehicle(f"N{i}", "Toyota", "Camry", 2024, rng.randint(30, 300)))
+    print(f"add_vehicle index inserts: {2_000 / (time.perf_counter() - start_time):,.0f} inserts/s")
+
+
+def stress_test_reservations(num_threads=16, num_vehicles=50, attempts=5_000, seed=1):
+    """Books random windows on a few shared vehicles from num_threads threads and checks
+    that no two successful reservations of one vehicle overlap and no ID repeats."""
+    system = CarRentalSystem(verbose=False)
+    store = Store(1, "Stress")
+    system.add_store(store)
+    vehicles = [Vehicle(f"V{i}", "Make", "Model", 2024, 50) for i in range(num_vehicles)]
+    for vehicle in vehicles:
+        store.add_vehicle(vehicle)
+    origin = datetime(2025, 1, 1)
+
+    def customer(thread_id):
+        rng = random.Random(seed + thread_id)
+        user = User(thread_id, f"User {thread_id}")
+        for _ in range(attempts):
+            start = origin + timedelta(days=rng.randint(0, 365))
+            system.make_reservation(user, rng.choice(vehicles), start, start + timedelta(days=rng.randint(1, 5)))
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # hand the GIL over between the calendar check and the booking
+    try:
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(num_threads) as pool:
+            for future in [pool.submit(customer, thread_id) for thread_id in range(num_threads)]:
+                future.result()  # re-raises anything a customer hit
+        elapsed = time.perf_counter() - start_time
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    ids = [reservation.reservation_id for reservation in system.reservations]
+    assert len(set(ids)) == len(ids), "a reservation ID was handed out twice"
+    conflicts = 0
+    for vehicle in vehicles:
+        booked = sorted((r.start_date, r.end_date) for r in system.reservations if r.vehicle is vehicle)
+        conflicts += sum(1 for (_, end), (start, _) in zip(booked, booked[1:]) if start < end)
+        assert len(booked) == len(vehicle.calendar), f"{vehicle.vehicle_id} calendar lost a booking"
+    assert conflicts == 0, f"{conflicts} double bookings"
+    total = num_threads * attempts
+    print(f"{num_threads} threads x {attempts:,} attempts on {num_vehicles} vehicles: "
+          f"{len(ids):,} booked, 0 conflicts, {total / elapsed:,.0f} attempts/s")
 
 
 if __name__ == "__main__":
@@ -108,4 +514,14 @@ if __name__ == "__main__":
 
             # Later, user returns the vehicle
             print("\nReturning vehicle...")
-            system.return_vehicle(reservation)
\ No newline at end of file
+            system.return_vehicle(reservation)
+
+            # The same car can be booked again for dates that do not overlap
+            later = system.make_reservation(user1, reservation.vehicle, datetime(2025, 8, 1), datetime(2025, 8, 3))
+            clash = system.make_reservation(user1, reservation.vehicle, datetime(2025, 7, 14), datetime(2025, 7, 16))
+            print(f"Booked again for August: {later is not None}, overlapping July booking refused: {clash is None}")
+
+    print()
+    benchmark_calendar()
+    benchmark_search()
+    stress_test_reservations()